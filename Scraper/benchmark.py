@@ -0,0 +1,173 @@
+"""
+Benchmarks the scraper end to end against the mock GitHub server (see mock_github.py), without network access.
+
+Runs Scraper.scrape_all() in a temporary working directory and reports repositories visited per minute,
+requests per repository, where the CPU time went, and peak memory. Example:
+python benchmark.py --repositories 2000 --max-visits 200 --latency 20
+"""
+
+import argparse, json, os, resource, shutil, sqlite3, sys, tempfile, time, tracemalloc
+import contextlib
+import requests
+import mock_github
+
+SCRAPER_DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+PHASES = ["visit_trending", "visit_topics", "visit_owners", "visit_repos", "export"]
+
+class CPUTimer:
+    """
+        Accumulates the process CPU time spent within wrapped functions.
+        Nested calls of the same timer are only counted once.
+    """
+    def __init__(self):
+        self.total = 0
+        self.depth = 0
+
+    def wrap(self, func):
+        def wrapper(*args, **kwargs):
+            self.depth += 1
+            start = time.process_time() if self.depth == 1 else None
+            try:
+                return func(*args, **kwargs)
+            finally:
+                if start != None:
+                    self.total += time.process_time() - start
+                self.depth -= 1
+        return wrapper
+
+def run_benchmark(args:argparse.Namespace) -> dict:
+    config = mock_github.config_from_arguments(args)
+    server_process, base_url = mock_github.start_server_process(config)
+    working_directory = tempfile.mkdtemp(prefix="scraper_benchmark_")
+    previous_directory = os.getcwd()
+    try:
+        # The scraper reads and writes its files in the working directory.
+        os.chdir(working_directory)
+        if args.record: # Recording forwards requests to GitHub, which needs a real token.
+            shutil.copy(os.path.join(previous_directory, "api_token.txt"), "api_token.txt")
+        else:
+            with open("api_token.txt", "w") as f:
+                f.write("mock-token")
+        if args.persistence.endswith(".db"):
+            shutil.copy(os.path.join(previous_directory, args.persistence), "persistence.db")
+            # Without its persistence.json the snapshot would be emptied, unless it's used on its own.
+            with contextlib.closing(sqlite3.connect("persistence.db")) as connection, connection:
+                connection.execute("DELETE FROM metadata WHERE key = 'source'")
+        elif args.persistence != "":
+            shutil.copy(os.path.join(previous_directory, args.persistence), "persistence.json")
+        os.environ["GITHUB_URL"] = base_url
+        os.environ["GITHUB_API_URL"] = base_url + mock_github.API_PREFIX
+        sys.path.insert(0, SCRAPER_DIRECTORY)
+
+        if args.tracemalloc:
+            tracemalloc.start()
+        wall_start = time.perf_counter()
+        cpu_start = os.times()
+        output = open(os.devnull, "w") if not args.verbose else sys.stdout
+        with contextlib.redirect_stdout(output):
+            import scrape
+
+            # Time HTML parsing separately from everything else
+            parse_timer = CPUTimer()
+            scrape.Soup = parse_timer.wrap(scrape.Soup)
+            if args.trending_languages >= 0:
+                scrape.Scraper.TRENDING_PAGE_LANGUAGES = scrape.Scraper.TRENDING_PAGE_LANGUAGES[:args.trending_languages]
+
+            startup_start = time.perf_counter()
+            scraper = scrape.Scraper()
+            startup_time = time.perf_counter() - startup_start
+            scrape.Scraper.MAX_REPOSITORY_VISITS = args.max_visits # Set after loading previous data, which raises the cap by the amount of persisted repos.
+            requests.post(f"{base_url}{mock_github.CONTROL_PREFIX}/reset") # Only count requests made by scraping.
+
+            phase_timers = {}
+            for phase in PHASES:
+                phase_timers[phase] = CPUTimer()
+                setattr(scraper, phase, phase_timers[phase].wrap(getattr(scraper, phase)))
+
+            error = None
+            scrape_start = time.perf_counter()
+            try:
+                scraper.scrape_all()
+            except Exception as e: # Ex. the scraper choking on an injected server error; report what was done until then.
+                error = f"{type(e).__name__}: {e}"
+            scrape_time = time.perf_counter() - scrape_start
+        cpu_end = os.times()
+        wall_time = time.perf_counter() - wall_start
+        traced_peak = tracemalloc.get_traced_memory()[1] if args.tracemalloc else None
+        if args.tracemalloc:
+            tracemalloc.stop()
+
+        server_stats = requests.get(f"{base_url}{mock_github.CONTROL_PREFIX}/stats").json()
+        repositories_visited = len(scraper.repository_visits)
+        return {
+            "error": error,
+            "repositories_visited": repositories_visited,
+            "owners_visited": len(scraper.owner_visits),
+            "topics_visited": len(scraper.topic_visits),
+            "wall_time": wall_time,
+            "startup_time": startup_time,
+            "scrape_time": scrape_time,
+            "repositories_per_minute": repositories_visited / (scrape_time / 60) if scrape_time > 0 else 0,
+            "requests": server_stats["requests"],
+            "requests_per_repository": server_stats["requests"] / repositories_visited if repositories_visited > 0 else None,
+            "requests_per_endpoint": server_stats["endpoints"],
+            "response_statuses": server_stats["statuses"],
+            "bytes_received": server_stats["bytes"],
+            "cpu_time": {
+                "user": cpu_end.user - cpu_start.user,
+                "system": cpu_end.system - cpu_start.system,
+                "html_parsing": parse_timer.total,
+                "phases": {phase: timer.total for phase, timer in phase_timers.items()},
+                "mock_server": server_stats["cpu_time"],
+            },
+            "peak_rss_kib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, # KiB on Linux
+            "peak_traced_memory_kib": traced_peak / 1024 if traced_peak != None else None,
+        }
+    finally:
+        os.chdir(previous_directory)
+        server_process.terminate()
+        if args.keep_output:
+            print("Scraper output kept in", working_directory)
+        else:
+            shutil.rmtree(working_directory, ignore_errors=True)
+
+def print_report(results:dict):
+    cpu = results["cpu_time"]
+    scraper_cpu = cpu["user"] + cpu["system"]
+    print(f"Repositories visited: {results['repositories_visited']} ({results['owners_visited']} owners, {results['topics_visited']} topics)")
+    if results["error"] != None:
+        print(f"Scraping aborted: {results['error']}")
+    print(f"Wall time: {results['wall_time']:.2f}s (startup {results['startup_time']:.2f}s, scraping {results['scrape_time']:.2f}s)")
+    print(f"Repositories/minute: {results['repositories_per_minute']:.1f}")
+    if results["requests_per_repository"] != None:
+        print(f"Requests: {results['requests']} ({results['requests_per_repository']:.2f} per repository, {results['bytes_received'] / 1024 / 1024:.1f} MiB received)")
+    print("  " + ", ".join(f"{k}: {v}" for k, v in sorted(results["requests_per_endpoint"].items(), key=lambda x: -x[1])))
+    print("  statuses: " + ", ".join(f"{k}: {v}" for k, v in sorted(results["response_statuses"].items())))
+    print(f"Scraper CPU time: {scraper_cpu:.2f}s (user {cpu['user']:.2f}s, system {cpu['system']:.2f}s)")
+    print(f"  HTML parsing: {cpu['html_parsing']:.2f}s ({cpu['html_parsing'] / scraper_cpu * 100 if scraper_cpu > 0 else 0:.0f}%)")
+    for phase, phase_time in cpu["phases"].items():
+        print(f"  {phase}: {phase_time:.2f}s")
+    print(f"Mock server CPU time: {cpu['mock_server']:.2f}s")
+    print(f"Peak RSS: {results['peak_rss_kib'] / 1024:.1f} MiB")
+    if results["peak_traced_memory_kib"] != None:
+        print(f"Peak traced Python memory: {results['peak_traced_memory_kib'] / 1024:.1f} MiB")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmarks the scraper against the mock GitHub server.")
+    mock_github.add_config_arguments(parser)
+    parser.add_argument("--max-visits", type=int, default=200, help="maximum repository visits, overriding Scraper.MAX_REPOSITORY_VISITS")
+    parser.add_argument("--trending-languages", type=int, default=-1, help="only visit the first N trending page languages")
+    parser.add_argument("--persistence", default="", help="persistence.json or snapshot .db to start from, for benchmarking warm starts")
+    parser.add_argument("--tracemalloc", action="store_true", help="also trace peak Python memory; slows down the run considerably")
+    parser.add_argument("--verbose", action="store_true", help="show the scraper's output")
+    parser.add_argument("--keep-output", action="store_true", help="keep the scraper's output files")
+    parser.add_argument("--json", default="", help="also write the results to this file")
+    args = parser.parse_args()
+    if args.record and args.fixtures == "":
+        parser.error("--record requires --fixtures")
+
+    results = run_benchmark(args)
+    print_report(results)
+    if args.json != "":
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
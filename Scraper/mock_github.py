@@ -0,0 +1,555 @@
+"""
+Local mock of github.com and api.github.com, for running the scraper offline.
+
+Serves the pages and REST/GraphQL endpoints the scraper visits. Responses come from
+recorded fixtures when available; otherwise they are generated from a deterministic
+synthetic set of users, repositories and topics, with markup matching what scrape.py parses.
+Latency, error rate and API rate limiting can be configured to simulate real conditions.
+
+The API is served under /api (like GitHub Enterprise does), so the scraper must be pointed at
+the server with the GITHUB_URL and GITHUB_API_URL environment variables, ex.
+GITHUB_URL=http://127.0.0.1:8000 GITHUB_API_URL=http://127.0.0.1:8000/api
+
+With --record, requests without a fixture are forwarded to the real GitHub and saved,
+so a session can be recorded once and replayed offline afterwards.
+"""
+
+import argparse, hashlib, json, os, random, threading, time
+import multiprocessing
+import urllib.parse
+from dataclasses import dataclass, field, asdict
+from html import escape
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+API_PREFIX = "/api"
+CONTROL_PREFIX = "/__mock__" # Endpoints for the benchmark harness; never counted in the stats.
+UPSTREAM_URL = "https://github.com"
+UPSTREAM_API_URL = "https://api.github.com"
+RECORDED_HEADERS = ["Content-Type", "Link"] # Headers kept when recording fixtures.
+
+@dataclass
+class MockConfig:
+    repositories: int = 2000 # Size of the synthetic dataset
+    seed: int = 0
+    latency: float = 0 # Seconds added to every response
+    jitter: float = 0 # Random extra seconds added on top of latency, uniformly distributed
+    error_rate: float = 0 # Chance of a request failing with a server error
+    rate_limit: int = 5000 # API requests allowed per rate limit window, like GitHub's authenticated limit
+    rate_limit_window: float = 3600 # In seconds
+    html_padding: int = 32 # KiB of filler markup added to HTML pages, to approximate the size of real ones
+    fixtures: str = "" # Directory of recorded fixtures
+    record: bool = False # Forward requests without fixtures to GitHub and save them
+
+@dataclass
+class MockResponse:
+    status: int = 200
+    headers: dict[str, str] = field(default_factory=dict)
+    body: str = ""
+
+class FixtureStore:
+    """
+        Recorded responses, stored as one .json file per request.
+        File names are hashes of the request; the request itself is kept in the file for readability.
+    """
+    def __init__(self, directory:str):
+        self.directory = directory
+
+    def key(method:str, path:str, query:str, body:bytes=b"") -> str:
+        key = f"{method} {path}"
+        if query != "":
+            key += "?" + query
+        if body:
+            key += " " + hashlib.sha1(body).hexdigest()
+        return key
+
+    def is_recordable(response:MockResponse) -> bool:
+        """
+            Returns whether a response should be saved as a fixture.
+            Server errors and rate limiting are transient, so they're not replayed; 404s are, as the scraper relies on them for deleted repositories.
+        """
+        return 200 <= response.status < 400 or response.status == 404
+
+    def path(self, key:str) -> str:
+        return os.path.join(self.directory, hashlib.sha1(key.encode()).hexdigest() + ".json")
+
+    def load(self, key:str) -> MockResponse:
+        path = self.path(key)
+        if not os.path.exists(path):
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return MockResponse(data["status"], data["headers"], data["body"])
+
+    def save(self, key:str, response:MockResponse):
+        if not os.path.exists(self.directory):
+            os.makedirs(self.directory)
+        with open(self.path(key), "w", encoding="utf-8") as f:
+            json.dump({"request": key, **asdict(response)}, f, indent=2)
+
+class SyntheticGitHub:
+    """
+        Deterministic fake set of users, repositories and topics.
+        Users pin their own repositories as well as some from other users, so crawling
+        from the trending and topic pages eventually reaches most of the repositories.
+    """
+    LANGUAGES = ["JavaScript", "TypeScript", "Python", "Java", "Kotlin", "C++", "C", "C#", "Rust", "Go", "Lua", "PHP", "Ruby", "Shell", "HTML", "Jupyter Notebook"]
+    LICENSES = ["MIT license", "Apache-2.0 license", "GPL-3.0 license", "BSD-3-Clause license", "Unlicense license", ""]
+    TOPICS = ["nodejs", "javascript", "npm", "next", "react", "nextjs", "angular", "react-native", "vue", "mod", "unity3d", "machine-learning", "deep-learning", "emulation",
+        "python", "rust", "cli", "docker", "api", "web", "game", "minecraft", "database", "devtools", "linux", "android", "ai", "llm", "data-science", "testing"]
+    REPOSITORIES_PER_USER = 4
+    TRENDING_ENTRIES = 25
+    TOPIC_ENTRIES = 20
+    PINNED_ENTRIES = 6
+
+    def __init__(self, repositories_amount:int, seed:int=0):
+        rng = random.Random(seed)
+        self.seed = seed
+        self.repositories:dict[str, dict] = {}
+        self.users:dict[str, list[str]] = {} # Username to identifiers of their repositories
+        self.pinned:dict[str, list[str]] = {}
+        self.topics:dict[str, list[str]] = {topic: [] for topic in SyntheticGitHub.TOPICS}
+
+        users_amount = max(1, repositories_amount // SyntheticGitHub.REPOSITORIES_PER_USER)
+        usernames = [f"dev-{i}" for i in range(users_amount)]
+        for username in usernames:
+            self.users[username] = []
+        for i in range(repositories_amount):
+            username = usernames[i % users_amount]
+            name = f"project-{i}"
+            key = f"{username}/{name}"
+            commits = rng.randint(2, 20000) # commitCount() expects a "last" page link, which single-page results lack.
+            open_issues = rng.randint(0, 2000)
+            open_prs = rng.randint(0, 300)
+            self.repositories[key] = {
+                "owner": username,
+                "repo": name,
+                "description": f"Synthetic repository {i}" if rng.random() > 0.1 else None,
+                "language": rng.choice(SyntheticGitHub.LANGUAGES) if rng.random() > 0.05 else "",
+                "license": rng.choice(SyntheticGitHub.LICENSES),
+                "topics": rng.sample(SyntheticGitHub.TOPICS, rng.randint(0, 5)),
+                "stars": int(rng.paretovariate(1.2) * 10),
+                "forks": rng.randint(0, 5000),
+                "watchers": rng.randint(0, 2000),
+                "contributors": rng.choice([1, rng.randint(2, 50), rng.randint(50, 3000)]),
+                "commits": commits,
+                "open_issues": open_issues,
+                "closed_issues": open_issues * rng.randint(0, 10),
+                "open_prs": open_prs,
+                "closed_prs": open_prs * rng.randint(0, 20),
+            }
+            self.users[username].append(key)
+            for topic in self.repositories[key]["topics"]:
+                self.topics[topic].append(key)
+
+        keys = list(self.repositories.keys())
+        for username, repositories in self.users.items():
+            pinned = repositories[:SyntheticGitHub.PINNED_ENTRIES - 2]
+            pinned += rng.sample(keys, min(2, len(keys)))
+            self.pinned[username] = pinned
+        for topic, repositories in self.topics.items():
+            repositories.sort(key=lambda key: self.repositories[key]["stars"], reverse=True)
+
+    def rng(self, *args) -> random.Random:
+        """
+            Returns a random generator seeded by the arguments, so each page is generated the same way every time.
+        """
+        return random.Random(":".join([str(self.seed)] + [str(arg) for arg in args]))
+
+    def trending(self, language:str) -> list[str]:
+        candidates = [key for key, repo in self.repositories.items() if repo["language"].lower() == language]
+        if language == "" or len(candidates) == 0:
+            candidates = list(self.repositories.keys())
+        rng = self.rng("trending", language)
+        return rng.sample(candidates, min(SyntheticGitHub.TRENDING_ENTRIES, len(candidates)))
+
+    def commits(self, key:str, page:int, per_page:int) -> list[dict]:
+        repo = self.repositories[key]
+        rng = self.rng("commits", key, page)
+        start = (page - 1) * per_page
+        commits = []
+        for i in range(start, min(start + per_page, repo["commits"])):
+            sha = hashlib.sha1(f"{key}:{i}".encode()).hexdigest()
+            author = rng.choice([repo["owner"], f"dev-{rng.randint(0, len(self.users) - 1)}", None])
+            commits.append({
+                "sha": sha,
+                "commit": {"message": rng.choice(["Fix typo in README", "Add tests", "Update dependencies", "Refactor parser\n\nSplit into smaller functions."])},
+                "author": {"login": author} if author != None else None,
+            })
+        return commits
+
+def format_number(number:int) -> str:
+    return f"{number:,}"
+
+def format_suffixed_number(number:int) -> str:
+    """
+        Formats numbers the way GitHub does in topic pages, ex. "12.3k".
+    """
+    if number >= 1000000:
+        return f"{number / 1000000:.1f}m"
+    elif number >= 1000:
+        return f"{number / 1000:.1f}k"
+    return str(number)
+
+class PageRenderer:
+    """
+        Renders HTML pages with the same structure as GitHub's, for the elements the scraper looks for.
+    """
+    def __init__(self, world:SyntheticGitHub, padding_kib:int):
+        self.world = world
+        filler_entry = '<div class="d-flex flex-items-center"><a href="#" class="Link--secondary">Navigation</a><span class="Counter">0</span></div>\n'
+        self.filler = filler_entry * (padding_kib * 1024 // len(filler_entry))
+
+    def page(self, content:str) -> str:
+        return f"<!DOCTYPE html>\n<html><head><title>GitHub</title></head><body>\n<header>{self.filler}</header>\n<main>{content}</main>\n</body></html>"
+
+    def trending(self, language:str) -> str:
+        articles = []
+        for key in self.world.trending(language):
+            stars_today = self.world.rng("stars_today", key, language).randint(0, 2000)
+            quoted_key = urllib.parse.quote("/" + key, safe="")
+            stars = f'<span class="d-inline-block float-sm-right">\n<svg class="octicon octicon-star"></svg>\n {format_number(stars_today)} stars today</span>' if stars_today > 0 else ""
+            articles.append(f'<article class="Box-row">\n<a href="/login?return_to={quoted_key}">Star</a>\n<h2 class="h3 lh-condensed"><a href="/{key}">{escape(key)}</a></h2>\n<a href="/{key}/stargazers">Stargazers</a>\n{stars}\n</article>')
+        return self.page('<div data-hpc>\n' + "\n".join(articles) + '\n</div>')
+
+    def topic(self, topic:str) -> str:
+        repositories = self.world.topics.get(topic, [])
+        rng = self.world.rng("topic", topic)
+        followers = f'<span>\n<svg class="octicon octicon-people mr-1"></svg>{format_suffixed_number(rng.randint(0, 50000))} followers</span>' if topic in self.world.topics else ""
+        header = f'<h2 class="h3 color-fg-muted">Here are {format_number(len(repositories))} public repositories matching this topic...</h2>'
+        languages = [self.world.repositories[key]["language"] for key in repositories if self.world.repositories[key]["language"] != ""]
+        languages_menu = ""
+        if len(languages) > 0:
+            main_language = max(set(languages), key=languages.count)
+            languages_menu = f'<details-menu class="select-menu-modal position-absolute">\n<div class="select-menu-header">Language</div>\n<div class="select-menu-list">\n<a href="/topics/{topic}">All</a>\n<a href="/topics/{topic}?l={main_language.lower()}"><span>{escape(main_language)}</span></a>\n</div></details-menu>'
+        articles = []
+        for key in repositories[:SyntheticGitHub.TOPIC_ENTRIES]:
+            owner, name = key.split("/")
+            articles.append(f'<article class="border rounded color-shadow-small color-bg-subtle my-4">\n<h3>\n<a href="/{owner}">{escape(owner)}</a>\n<a href="/{key}">{escape(name)}</a></h3>\n</article>')
+        return self.page(f"{followers}\n{header}\n{languages_menu}\n" + "\n".join(articles))
+
+    def repository(self, key:str) -> str:
+        repo = self.world.repositories[key]
+        content = ""
+        if repo["contributors"] > 1:
+            content += f'<a href="/{key}/graphs/contributors" class="Link--primary no-underline Link d-flex flex-items-center">Contributors <span class="Counter">{format_number(repo["contributors"])}</span></a>\n'
+        if repo["license"] != "":
+            content += f'<div>\n<svg class="octicon octicon-law mr-2"></svg>\n{escape(repo["license"])}\n</div>\n'
+        for topic in repo["topics"]:
+            content += f'<a class="topic-tag topic-tag-link" href="/topics/{topic}">\n  {topic}\n</a>\n'
+        if repo["language"] != "":
+            content += f'<div><h2 class="h4 mb-3">Languages</h2>\n<ul>\n<li><a href="/{key}/search?l={repo["language"].lower()}"><svg class="octicon octicon-dot-fill"></svg><span class="color-fg-default text-bold mr-1">{escape(repo["language"])}</span><span>87.5%</span></a></li>\n</ul></div>\n'
+        return self.page(content)
+
+    def states(self, key:str, kind:str) -> str:
+        repo = self.world.repositories[key]
+        open_amount, closed_amount = (repo["open_issues"], repo["closed_issues"]) if kind == "issues" else (repo["open_prs"], repo["closed_prs"])
+        return self.page(f'<div class="table-list-header-toggle states flex-auto pl-0">\n<a href="/{key}/{kind}?q=is%3Aopen" class="btn-link selected">\n<svg class="octicon octicon-issue-opened"></svg>\n {format_number(open_amount)} Open\n</a>\n<a href="/{key}/{kind}?q=is%3Aclosed" class="btn-link">\n<svg class="octicon octicon-check"></svg>\n {format_number(closed_amount)} Closed\n</a>\n</div>')
+
+    def user(self, username:str) -> str:
+        items = []
+        for key in self.world.pinned[username]:
+            items.append(f'<li><a href="/{key}"><span class="repo">{escape(key)}</span></a>\n<a href="/{key}/stargazers">Stars</a></li>')
+        return self.page('<div class="js-pinned-items-reorder-container">\n<ol>\n' + "\n".join(items) + '\n</ol>\n</div>')
+
+    def contributions(self, username:str) -> str:
+        # This page is a fragment loaded by the profile page, so it has no padding.
+        contributions = self.world.rng("contributions", username).randint(0, 5000)
+        return f'<div class="js-yearly-contributions"><h2 class="f4 text-normal mb-2">\n  {format_number(contributions)} contributions\n  in the last year\n</h2></div>'
+
+class MockGitHub:
+    """
+        Routes requests to fixtures or synthetic responses, and applies the simulated network conditions.
+    """
+    def __init__(self, config:MockConfig):
+        self.config = config
+        self.world = SyntheticGitHub(config.repositories, config.seed)
+        self.renderer = PageRenderer(self.world, config.html_padding)
+        self.fixtures = FixtureStore(config.fixtures) if config.fixtures != "" else None
+        self.rng = random.Random(config.seed)
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.stats = {"requests": 0, "bytes": 0, "endpoints": {}, "statuses": {}, "fixture_hits": 0, "recorded": 0}
+            self.rate_limit_used = 0
+            self.rate_limit_reset = time.time() + self.config.rate_limit_window
+            self.cpu_start = time.process_time()
+
+    def get_stats(self) -> dict:
+        with self.lock:
+            return {**self.stats, "cpu_time": time.process_time() - self.cpu_start}
+
+    def endpoint(path:str) -> str:
+        """
+            Returns the name of the endpoint a path belongs to, for grouping stats.
+        """
+        is_api = path.startswith(API_PREFIX + "/") or path == API_PREFIX
+        parts = [part for part in (path[len(API_PREFIX):] if is_api else path).split("/") if part != ""]
+        if is_api:
+            if parts == ["graphql"]:
+                return "graphql"
+            elif len(parts) == 3 and parts[0] == "repos":
+                return "api_repo"
+            elif len(parts) == 4 and parts[0] == "repos" and parts[3] == "commits":
+                return "api_commits"
+            elif len(parts) == 2 and parts[0] == "users":
+                return "api_user"
+            return "api_other"
+        if len(parts) > 0 and parts[0] == "trending":
+            return "trending"
+        elif len(parts) == 2 and parts[0] == "topics":
+            return "topic"
+        elif len(parts) == 3 and parts[0] == "users" and parts[2] == "contributions":
+            return "contributions"
+        elif len(parts) == 1:
+            return "user"
+        elif len(parts) == 2:
+            return "repo"
+        elif len(parts) == 3 and parts[2] in ["issues", "pulls"]:
+            return parts[2]
+        return "other"
+
+    def handle(self, method:str, path:str, query:str, body:bytes, headers:dict, base_url:str) -> MockResponse:
+        endpoint = MockGitHub.endpoint(path)
+        is_api = endpoint.startswith("api_") or endpoint == "graphql"
+        with self.lock:
+            failed = self.rng.random() < self.config.error_rate
+            delay = self.config.latency + self.rng.random() * self.config.jitter
+            if is_api:
+                if time.time() > self.rate_limit_reset:
+                    self.rate_limit_used = 0
+                    self.rate_limit_reset = time.time() + self.config.rate_limit_window
+                self.rate_limit_used += 1
+                rate_limit_used = self.rate_limit_used
+        if delay > 0:
+            time.sleep(delay)
+
+        response = None
+        rate_limited = is_api and rate_limit_used > self.config.rate_limit
+        if failed:
+            response = MockResponse(500, {"Content-Type": "application/json"}, json.dumps({"message": "Server Error"})) if is_api else MockResponse(502, {"Content-Type": "text/html"}, "<html><body>Bad Gateway</body></html>")
+        elif rate_limited:
+            response = MockResponse(403, {"Content-Type": "application/json"}, json.dumps({"message": "API rate limit exceeded", "documentation_url": "https://docs.github.com/rest/overview/resources-in-the-rest-api#rate-limiting"}))
+        else:
+            key = FixtureStore.key(method, path, query, body)
+            if self.fixtures != None:
+                response = self.fixtures.load(key)
+                if response != None:
+                    with self.lock:
+                        self.stats["fixture_hits"] += 1
+                elif self.config.record:
+                    response = self.forward(method, path, query, body, headers)
+                    if FixtureStore.is_recordable(response):
+                        self.fixtures.save(key, response)
+                        with self.lock:
+                            self.stats["recorded"] += 1
+            if response == None:
+                response = self.synthesize(endpoint, method, path, query, body, base_url)
+
+        # Point links from recorded responses back at the mock server
+        if "Link" in response.headers:
+            response.headers["Link"] = response.headers["Link"].replace(UPSTREAM_API_URL, base_url + API_PREFIX)
+        if is_api:
+            response.headers["X-RateLimit-Limit"] = str(self.config.rate_limit)
+            response.headers["X-RateLimit-Remaining"] = str(max(0, self.config.rate_limit - rate_limit_used))
+            response.headers["X-RateLimit-Used"] = str(rate_limit_used)
+            response.headers["X-RateLimit-Reset"] = str(int(self.rate_limit_reset))
+            response.headers["X-RateLimit-Resource"] = "graphql" if endpoint == "graphql" else "core"
+
+        with self.lock:
+            self.stats["requests"] += 1
+            self.stats["bytes"] += len(response.body.encode())
+            self.stats["endpoints"][endpoint] = self.stats["endpoints"].get(endpoint, 0) + 1
+            self.stats["statuses"][str(response.status)] = self.stats["statuses"].get(str(response.status), 0) + 1
+        return response
+
+    def forward(self, method:str, path:str, query:str, body:bytes, headers:dict) -> MockResponse:
+        """
+            Performs the request against the real GitHub, for recording fixtures.
+        """
+        import requests # Only needed when recording.
+        url = UPSTREAM_API_URL + path[len(API_PREFIX):] if path.startswith(API_PREFIX + "/") else UPSTREAM_URL + path
+        if query != "":
+            url += "?" + query
+        forwarded_headers = {k: v for k, v in headers.items() if k in ["Accept", "Authorization", "X-GitHub-Api-Version", "Content-Type"]}
+        result = requests.request(method, url, data=body if body else None, headers=forwarded_headers)
+        return MockResponse(result.status_code, {k: result.headers[k] for k in RECORDED_HEADERS if k in result.headers}, result.text)
+
+    def synthesize(self, endpoint:str, method:str, path:str, query:str, body:bytes, base_url:str) -> MockResponse:
+        """
+            Generates a response from the synthetic dataset.
+        """
+        parts = [urllib.parse.unquote(part) for part in path.split("/") if part != ""]
+        params = urllib.parse.parse_qs(query)
+        world = self.world
+        not_found_json = MockResponse(404, {"Content-Type": "application/json"}, json.dumps({"message": "Not Found"}))
+        not_found_html = MockResponse(404, {"Content-Type": "text/html"}, "Not Found")
+
+        def html(text):
+            return MockResponse(200, {"Content-Type": "text/html; charset=utf-8"}, text)
+        def api(data, headers={}):
+            return MockResponse(200, {"Content-Type": "application/json; charset=utf-8", **headers}, json.dumps(data))
+
+        if endpoint == "trending":
+            return html(self.renderer.trending(parts[1].lower() if len(parts) > 1 else ""))
+        elif endpoint == "topic":
+            return html(self.renderer.topic(parts[1]))
+        elif endpoint == "user" and parts[0] in world.users:
+            return html(self.renderer.user(parts[0]))
+        elif endpoint == "contributions" and parts[1] in world.users:
+            return html(self.renderer.contributions(parts[1]))
+        elif endpoint in ["repo", "issues", "pulls"] and "/".join(parts[:2]) in world.repositories:
+            key = "/".join(parts[:2])
+            return html(self.renderer.repository(key) if endpoint == "repo" else self.renderer.states(key, endpoint))
+        elif endpoint == "api_repo" and "/".join(parts[2:4]) in world.repositories:
+            repo = world.repositories["/".join(parts[2:4])]
+            return api({
+                "name": repo["repo"],
+                "full_name": f"{repo['owner']}/{repo['repo']}",
+                "owner": {"login": repo["owner"], "type": "User"},
+                "description": repo["description"],
+                "language": repo["language"] if repo["language"] != "" else None,
+                "topics": repo["topics"],
+                "forks_count": repo["forks"],
+                "stargazers_count": repo["stars"],
+                "subscribers_count": repo["watchers"],
+                "open_issues_count": repo["open_issues"] + repo["open_prs"],
+            })
+        elif endpoint == "api_commits" and "/".join(parts[2:4]) in world.repositories:
+            key = "/".join(parts[2:4])
+            per_page = min(100, int(params.get("per_page", ["30"])[0]))
+            page = int(params.get("page", ["1"])[0])
+            last_page = (world.repositories[key]["commits"] + per_page - 1) // per_page
+            url = f"{base_url}{API_PREFIX}/repos/{key}/commits?per_page={per_page}"
+            links = []
+            if page < last_page:
+                links.append(f'<{url}&page={page + 1}>; rel="next"')
+                links.append(f'<{url}&page={last_page}>; rel="last"')
+            return api(world.commits(key, page, per_page), {"Link": ", ".join(links)} if len(links) > 0 else {})
+        elif endpoint == "api_user" and parts[2] in world.users:
+            username = parts[2]
+            return api({"login": username, "type": "User", "avatar_url": f"https://avatars.githubusercontent.com/u/{world.rng('avatar', username).randint(1, 10 ** 8)}?v=4", "public_repos": len(world.users[username])})
+        elif endpoint == "graphql" and method == "POST":
+            # Only repository lookups are supported; other queries need recorded fixtures.
+            variables = json.loads(body or b"{}").get("variables", {})
+            key = f"{variables.get('owner')}/{variables.get('name')}"
+            if key not in world.repositories:
+                return api({"data": {"repository": None}, "errors": [{"type": "NOT_FOUND", "message": f"Could not resolve to a Repository with the name '{key}'."}]})
+            repo = world.repositories[key]
+            return api({"data": {"repository": {
+                "nameWithOwner": key,
+                "description": repo["description"],
+                "stargazerCount": repo["stars"],
+                "forkCount": repo["forks"],
+                "watchers": {"totalCount": repo["watchers"]},
+                "primaryLanguage": {"name": repo["language"]} if repo["language"] != "" else None,
+                "repositoryTopics": {"nodes": [{"topic": {"name": topic}} for topic in repo["topics"]]},
+                "openIssues": {"totalCount": repo["open_issues"]},
+                "closedIssues": {"totalCount": repo["closed_issues"]},
+                "openPullRequests": {"totalCount": repo["open_prs"]},
+                "closedPullRequests": {"totalCount": repo["closed_prs"]},
+                "defaultBranchRef": {"target": {"history": {"totalCount": repo["commits"]}}},
+            }}})
+        return not_found_json if endpoint.startswith("api_") or endpoint == "graphql" else not_found_html
+
+class MockRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1" # Keep-alive, like the real servers.
+    mock:MockGitHub = None
+
+    def do_GET(self):
+        self.respond("GET")
+
+    def do_POST(self):
+        self.respond("POST")
+
+    def respond(self, method:str):
+        parsed = urllib.parse.urlsplit(self.path)
+        length = int(self.headers.get("Content-Length", 0))
+        body = self.rfile.read(length) if length > 0 else b""
+        base_url = "http://" + self.headers.get("Host", "%s:%d" % self.server.server_address[:2])
+
+        if parsed.path.startswith(CONTROL_PREFIX):
+            if parsed.path == CONTROL_PREFIX + "/reset":
+                self.mock.reset()
+            response = MockResponse(200, {"Content-Type": "application/json"}, json.dumps(self.mock.get_stats()))
+        else:
+            response = self.mock.handle(method, parsed.path, parsed.query, body, dict(self.headers), base_url)
+
+        encoded_body = response.body.encode("utf-8")
+        self.send_response(response.status)
+        for k, v in response.headers.items():
+            self.send_header(k, v)
+        self.send_header("Content-Length", str(len(encoded_body)))
+        self.end_headers()
+        self.wfile.write(encoded_body)
+
+    def log_message(self, format, *args):
+        pass # Logging every request would dominate the server's CPU time.
+
+def create_server(config:MockConfig, host:str="127.0.0.1", port:int=0) -> ThreadingHTTPServer:
+    handler = type("BoundMockRequestHandler", (MockRequestHandler,), {"mock": MockGitHub(config)})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+def _serve(config:MockConfig, host:str, port:int, address_queue):
+    server = create_server(config, host, port)
+    address_queue.put(server.server_address[:2])
+    server.serve_forever()
+
+def start_server_process(config:MockConfig, host:str="127.0.0.1", port:int=0) -> tuple[multiprocessing.Process, str]:
+    """
+        Runs the server in a separate process, so its CPU time and memory are not attributed to the scraper.
+        Returns the process and the server's base URL.
+    """
+    address_queue = multiprocessing.Queue()
+    process = multiprocessing.Process(target=_serve, args=(config, host, port, address_queue), daemon=True)
+    process.start()
+    host, port = address_queue.get(timeout=60)
+    return process, f"http://{host}:{port}"
+
+def add_config_arguments(parser:argparse.ArgumentParser):
+    defaults = MockConfig()
+    parser.add_argument("--repositories", type=int, default=defaults.repositories, help="amount of repositories in the synthetic dataset")
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    parser.add_argument("--latency", type=float, default=defaults.latency * 1000, help="milliseconds added to every response")
+    parser.add_argument("--jitter", type=float, default=defaults.jitter * 1000, help="maximum random milliseconds added on top of latency")
+    parser.add_argument("--error-rate", type=float, default=defaults.error_rate, help="chance of a request failing with a server error")
+    parser.add_argument("--rate-limit", type=int, default=defaults.rate_limit, help="API requests allowed per rate limit window")
+    parser.add_argument("--rate-limit-window", type=float, default=defaults.rate_limit_window, help="in seconds")
+    parser.add_argument("--html-padding", type=int, default=defaults.html_padding, help="KiB of filler markup added to HTML pages")
+    parser.add_argument("--fixtures", default=defaults.fixtures, help="directory of recorded fixtures")
+    parser.add_argument("--record", action="store_true", help="forward requests without fixtures to GitHub and record them")
+
+def config_from_arguments(args:argparse.Namespace) -> MockConfig:
+    return MockConfig(
+        repositories=args.repositories,
+        seed=args.seed,
+        latency=args.latency / 1000,
+        jitter=args.jitter / 1000,
+        error_rate=args.error_rate,
+        rate_limit=args.rate_limit,
+        rate_limit_window=args.rate_limit_window,
+        html_padding=args.html_padding,
+        fixtures=args.fixtures,
+        record=args.record,
+    )
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Mock GitHub server for running the scraper offline.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    add_config_arguments(parser)
+    args = parser.parse_args()
+    if args.record and args.fixtures == "":
+        parser.error("--record requires --fixtures")
+
+    server = create_server(config_from_arguments(args), args.host, args.port)
+    base_url = "http://%s:%d" % server.server_address[:2]
+    print(f"Serving mock GitHub at {base_url}")
+    print(f"Run the scraper with GITHUB_URL={base_url} GITHUB_API_URL={base_url}{API_PREFIX}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
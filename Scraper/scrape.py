@@ -8,28 +8,37 @@ from utils import *
 from Entities.Repository import *
 from Entities.RepositoryOwners import *
 from Entities.Trends import *
+from snapshot import *
 
 COMMITS_REGEX = re.compile(r"([,\d]+) Commits$")
 CONTRIBUTIONS_REGEX = re.compile(r"([,\d]+)")
 URL_RETURN_TO_REGEX = re.compile(r"\/login\?return_to=(.+)")
+# Overridable to point the scraper at another host, ex. the mock server used for benchmarks.
+GITHUB_URL = os.environ.get("GITHUB_URL", "https://github.com")
+GITHUB_API_URL = os.environ.get("GITHUB_API_URL", "https://api.github.com")
+PERSISTENCE_PATH = "persistence.json"
+SNAPSHOT_PATH = "persistence.db"
 API_TOKEN = None
-with open("api_token.txt", "r") as f: # Put your Personal Access Token in the file.
-    API_TOKEN = f.read()
 
-HEADERS = {
-    "Accept": "application/vnd.github+json",
-    "Authorization": "Bearer " + API_TOKEN,
-    "X-GitHub-Api-Version": "2022-11-28",
-}
+def get_headers() -> dict[str, str]:
+    """
+        Returns the headers for GitHub API requests.
+        The token is read on first use rather than on import.
+    """
+    global API_TOKEN
+    if API_TOKEN == None:
+        with open("api_token.txt", "r") as f: # Put your Personal Access Token in the file.
+            API_TOKEN = f.read().strip()
+    return {
+        "Accept": "application/vnd.github+json",
+        "Authorization": "Bearer " + API_TOKEN,
+        "X-GitHub-Api-Version": "2022-11-28",
+    }
 
 # Source: https://gist.github.com/codsane/25f0fd100b565b3fce03d4bbd7e7bf33
 # Fetching this number via HTML broke sometime in March 2024. 
 def commitCount(u, r):
-    req = requests.get('https://api.github.com/repos/{}/{}/commits?per_page=1'.format(u, r), headers={
-        "Accept": "application/vnd.github+json",
-        "Authorization": "Bearer " + API_TOKEN,
-        "X-GitHub-Api-Version": "2022-11-28",
-    })
+    req = requests.get('{}/repos/{}/{}/commits?per_page=1'.format(GITHUB_API_URL, u, r), headers=get_headers())
     s = req.links['last']['url']
     s = re.search('\d+$', s).group()
     return s
@@ -40,10 +49,12 @@ class Scraper:
     DEFAULT_TOPICS_TO_VISIT = ["nodejs", "javascript", "npm", "next", "react", "nextjs", "angular", "react-native", "vue", "mod", "unity3d", "machine-learning", "deep-learning", "emulation"]
     MAX_REPOSITORY_VISITS = 6000
     REPOSITORY_VISIT_EXPORT_INTERVAL = 50 # Determines every how many repository visits scraping data will be saved
+    MAX_TOPICS_TO_VISIT = 100 # Topics from previously visited repos are only queued up to this amount
 
     def __init__(self):
-        self.repositories:dict[str, Repository] = {} # Visited repositories
-        self.owners:dict[str, RepositoryOwner] = {} # Visited users
+        self.snapshot = Snapshot(SNAPSHOT_PATH, PERSISTENCE_PATH) # Data from previous sessions
+        self.repositories:dict[str, Repository] = LazyEntityDict(self.load_repository) # Visited repositories
+        self.owners:dict[str, RepositoryOwner] = LazyEntityDict(self.load_owner) # Visited users
         self.queued_repositories = [] # Repositories queued for visit
         self.queued_owners = []
         self.topics:dict[str, Topic] = {}
@@ -62,24 +73,33 @@ class Scraper:
         """
             Loads data for previously-visited repositories and users,
             to queue them for a visit in this session.
+            Only their keys are read; the entities themselves are loaded from the snapshot when accessed.
         """
-        if os.path.exists(os.getcwd() + "/persistence.json"):
-            with open("persistence.json", "r") as f:
-                data = json.load(f)
-                for k, v in data["repositories"].items():
-                    repo = Repository(v["owner"], v["repo"], v["main_language"], v["license"], v["tags"], v["description"])
-                    self.repositories[k] = repo
-                    self.queue_repo(v["owner"], v["repo"])
-
-                    # Queue tags from previously visited repos
-                    for topic in repo.tags:
-                        if topic not in self.topics_to_visit and len(self.topics_to_visit) < 100:
-                            print("Adding topic from repo", topic)
-                            self.topics_to_visit.append(topic)
-                    Scraper.MAX_REPOSITORY_VISITS += 1
-                for k, v in data["owners"].items():
-                    self.owners[k] = RepositoryOwner(v["username"], v["avatar_url"], set(v["repositories"]))
-                    self.queue_owner(v["username"])
+        if self.snapshot.exists():
+            repository_keys = self.snapshot.repository_keys()
+            self.repositories = LazyEntityDict(self.load_repository, [k for k, _, _ in repository_keys])
+            for _, owner, repo in repository_keys:
+                self.queue_repo(owner, repo)
+            Scraper.MAX_REPOSITORY_VISITS += len(repository_keys)
+
+            owner_keys = self.snapshot.owner_keys()
+            self.owners = LazyEntityDict(self.load_owner, owner_keys)
+            for username in owner_keys:
+                self.queue_owner(username)
+
+            # Queue tags from previously visited repos
+            queued_topics = set(self.topics_to_visit)
+            remaining_topics = max(0, Scraper.MAX_TOPICS_TO_VISIT - len(self.topics_to_visit))
+            new_topics = [topic for topic in self.snapshot.tags(remaining_topics + len(queued_topics)) if topic not in queued_topics][:remaining_topics]
+            self.topics_to_visit.extend(new_topics)
+            print(f"Loaded {len(repository_keys)} repositories and {len(owner_keys)} owners; added {len(new_topics)} topics from repos")
+
+    def load_repository(self, key:str) -> Repository:
+        return Repository(**self.snapshot.load_repository(key))
+
+    def load_owner(self, username:str) -> RepositoryOwner:
+        v = self.snapshot.load_owner(username)
+        return RepositoryOwner(v["username"], v["avatar_url"], set(v["repositories"]))
 
     def visit_owners(self):
         """
@@ -124,7 +144,7 @@ class Scraper:
         """
             Extracts information from a topic page.
         """
-        soup = Scraper.get_page(f"https://github.com/topics/{topic_name}")
+        soup = Scraper.get_page(f"{GITHUB_URL}/topics/{topic_name}")
         topic = Topic(topic_name)
         visit = TopicVisit(name=topic_name)
         print(f"Visiting topic", topic_name)
@@ -164,15 +184,20 @@ class Scraper:
         """
             Saves the data of all entities and visits to files.
         """
-        with open("persistence.json", "w") as f:
+        # Entities that were never loaded are unchanged, so only the loaded ones need to be saved to the snapshot.
+        self.snapshot.save([(k, v.dict()) for k, v in self.repositories.loaded_items()], [(k, v.dict()) for k, v in self.owners.loaded_items()])
+        # persistence.json is still rewritten in full on every export, reading all entities back from the snapshot.
+        # It's the only place topics, commits and trends are saved, and create_csv.py reads it, so it must stay up to date.
+        with open(PERSISTENCE_PATH, "w") as f:
             output = {
-                "repositories": {k: v.dict() for k, v in self.repositories.items()},
-                "owners": {k: v.dict() for k, v in self.owners.items()},
+                "repositories": self.snapshot.all_repositories(),
+                "owners": self.snapshot.all_owners(),
                 "topics": {k: v.dict() for k, v in self.topics.items()},
                 "commits": {k: v.dict() for k, v in self.commits.items()},
                 "trending_per_language": {k: [x.dict() for x in v] for k, v in self.trending.items()},
             }
             json.dump(output, f, indent=2)
+        self.snapshot.mark_synced()
 
         today_str = datetime.datetime.today().strftime('%Y-%m-%d')
         if not os.path.exists("visits"):
@@ -235,11 +260,11 @@ class Scraper:
             Extracts information from a user or organization page.
         """
         if self.is_owner_visited(username): return
-        soup = Scraper.get_page(f"https://github.com/{username}")
+        soup = Scraper.get_page(f"{GITHUB_URL}/{username}")
         user = User(username)
         visit = UserVisit(username=username)
         
-        req = requests.get(f"https://api.github.com/users/{username}", headers=HEADERS)
+        req = requests.get(f"{GITHUB_API_URL}/users/{username}", headers=get_headers())
         if req.status_code == 200:
             json = req.json()
             user.avatar_url = json["avatar_url"]
@@ -259,7 +284,7 @@ class Scraper:
                     self.queue_repo(username, repo)
 
         # Get yearly contributions
-        soup = Scraper.get_page(f"https://github.com/users/{username}/contributions")
+        soup = Scraper.get_page(f"{GITHUB_URL}/users/{username}/contributions")
         if soup != None and soup.contents[0] != "Not Found":
             header = soup.find("h2")
             visit.contributions_last_year = parse_suffixed_number(CONTRIBUTIONS_REGEX.search(header.contents[0]).group())
@@ -276,14 +301,14 @@ class Scraper:
             Extracts information from a repository page.
         """
         url_suffix = identifier(username, repo_name)
-        url = f"https://github.com/{url_suffix}"
+        url = f"{GITHUB_URL}/{url_suffix}"
         print("Extracting", url)
 
         soup = Scraper.get_page(url)
         repo = Repository(username, repo_name)
         visit = RepositoryVisit(owner=username, repo=repo_name)
         
-        req = requests.get(f"https://api.github.com/repos/{username}/{repo_name}", headers=HEADERS)
+        req = requests.get(f"{GITHUB_API_URL}/repos/{username}/{repo_name}", headers=get_headers())
         
         # Get forks amount
         if req.status_code == 200:
@@ -316,11 +341,7 @@ class Scraper:
             repo.tags.append(str.strip(tag.contents[0]))
 
         # Get commit messages for newest commits
-        result = requests.get(f"https://api.github.com/repos/{username}/{repo_name}/commits?per_page=50", headers={
-            "Accept": "application/vnd.github+json",
-            "Authorization": "Bearer " + API_TOKEN,
-            "X-GitHub-Api-Version": "2022-11-28",
-        })
+        result = requests.get(f"{GITHUB_API_URL}/repos/{username}/{repo_name}/commits?per_page=50", headers=get_headers())
         if result.status_code == 200:
             json = result.json()
             for commit in json:
@@ -347,7 +368,7 @@ class Scraper:
             repo.main_language = main_language
 
         # Fetch open & closed issues amount
-        page = Scraper.get_page(f"https://github.com/{url_suffix}/issues")
+        page = Scraper.get_page(f"{GITHUB_URL}/{url_suffix}/issues")
         div = page.find("div", class_="table-list-header-toggle states flex-auto pl-0")
         if div != None:
             issue_links = div.findAll("a")
@@ -357,7 +378,7 @@ class Scraper:
             visit.closed_issues_amount = get_int(closed_issues.contents[2], CONTRIBUTIONS_REGEX)
 
         # Fetch open & closed PRs amount
-        page = Scraper.get_page(f"https://github.com/{url_suffix}/pulls")
+        page = Scraper.get_page(f"{GITHUB_URL}/{url_suffix}/pulls")
         div = page.find("div", class_="table-list-header-toggle states flex-auto pl-0")
         if div != None:
             issue_links = div.findAll("a")
@@ -388,7 +409,7 @@ class Scraper:
             Extracts information from a trending repositories page.
         """
         language = urllib.parse.quote(language)
-        soup = Scraper.get_page(f"https://github.com/trending/{language.lower()}?since=daily")
+        soup = Scraper.get_page(f"{GITHUB_URL}/trending/{language.lower()}?since=daily")
         print("Visiting trending", language)
         container = soup.find("div", {"data-hpc": True})
 
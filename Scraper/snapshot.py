@@ -0,0 +1,193 @@
+"""
+Indexed snapshot of the scraper's persisted data, for fast warm starts.
+
+persistence.json has to be parsed in full before anything can be read from it.
+The snapshot keeps the same repositories and owners in a SQLite database instead, so
+a new session only needs to read their keys up front; the entities themselves are
+loaded when first accessed. The snapshot is built from persistence.json the first time
+it's needed, rebuilt if persistence.json is changed by something other than the scraper,
+and emptied if persistence.json is deleted.
+"""
+
+import json, os, sqlite3
+from collections.abc import MutableMapping
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS repositories (key TEXT PRIMARY KEY, owner TEXT NOT NULL, repo TEXT NOT NULL, data TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS owners (username TEXT PRIMARY KEY, data TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS repository_tags (key TEXT NOT NULL, position INTEGER NOT NULL, tag TEXT NOT NULL, PRIMARY KEY (key, position)); -- Tags of each repository, in their order
+CREATE TABLE IF NOT EXISTS metadata (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+"""
+SCHEMA_VERSION = "1" # Snapshots from other versions are rebuilt from the source .json
+
+class Snapshot:
+    def __init__(self, path:str, source_path:str):
+        self.path = path
+        self.source_path = source_path # The persistence .json this snapshot mirrors
+        self.connection:sqlite3.Connection = None
+
+    def exists(self) -> bool:
+        """
+            Returns whether there's previous data, which follows the source .json if the snapshot was built from one.
+        """
+        if os.path.exists(self.source_path):
+            return True
+        if not os.path.exists(self.path):
+            return False
+        return self.connect().execute("SELECT 1 FROM repositories UNION ALL SELECT 1 FROM owners LIMIT 1").fetchone() != None
+
+    def connect(self) -> sqlite3.Connection:
+        """
+            Opens the database, (re)building it from the source .json if it's missing or out of date.
+            A snapshot built from a source .json that no longer exists is emptied, as its data was deleted.
+        """
+        if self.connection == None:
+            self.connection = sqlite3.connect(self.path)
+            self.connection.executescript(SCHEMA)
+            if os.path.exists(self.source_path):
+                if self.get_metadata("schema") != SCHEMA_VERSION or self.get_metadata("source") != Snapshot.file_signature(self.source_path):
+                    self.import_json()
+            elif self.get_metadata("source") != None:
+                self.clear()
+        return self.connection
+
+    def close(self):
+        if self.connection != None:
+            self.connection.close()
+            self.connection = None
+
+    def file_signature(path:str) -> str:
+        stat = os.stat(path)
+        return f"{stat.st_mtime_ns}:{stat.st_size}"
+
+    def get_metadata(self, key:str) -> str:
+        row = self.connection.execute("SELECT value FROM metadata WHERE key = ?", (key,)).fetchone()
+        return row[0] if row != None else None
+
+    def clear(self):
+        """
+            Removes all the data of the snapshot, and the signature of the source .json it was built from.
+        """
+        with self.connection:
+            self.connection.execute("DELETE FROM repositories")
+            self.connection.execute("DELETE FROM owners")
+            self.connection.execute("DELETE FROM repository_tags")
+            self.connection.execute("DELETE FROM metadata WHERE key = 'source'")
+
+    def import_json(self):
+        """
+            Replaces the contents of the snapshot with the ones of the source .json.
+        """
+        print("Building snapshot from", self.source_path)
+        with open(self.source_path, "r") as f:
+            data = json.load(f)
+        with self.connection:
+            self.connection.execute("DELETE FROM repositories")
+            self.connection.execute("DELETE FROM owners")
+            self.connection.execute("DELETE FROM repository_tags")
+            self.write_repositories(data["repositories"].items())
+            self.write_owners(data["owners"].items())
+            self.connection.execute("INSERT OR REPLACE INTO metadata VALUES ('schema', ?)", (SCHEMA_VERSION,))
+            self.connection.execute("INSERT OR REPLACE INTO metadata VALUES ('source', ?)", (Snapshot.file_signature(self.source_path),))
+
+    def write_repositories(self, items):
+        rows = []
+        tags = []
+        for k, v in items:
+            rows.append((k, v["owner"], v["repo"], json.dumps(v)))
+            tags.extend((k, position, tag) for position, tag in enumerate(v["tags"]))
+        # Upserting keeps the rowid of existing rows, and thus their order.
+        self.connection.executemany("INSERT INTO repositories VALUES (?, ?, ?, ?) ON CONFLICT(key) DO UPDATE SET data = excluded.data", rows)
+        # Tags are replaced rather than merged, as repositories can lose tags between visits.
+        self.connection.executemany("DELETE FROM repository_tags WHERE key = ?", [(row[0],) for row in rows])
+        self.connection.executemany("INSERT INTO repository_tags VALUES (?, ?, ?)", tags)
+
+    def write_owners(self, items):
+        self.connection.executemany("INSERT INTO owners VALUES (?, ?) ON CONFLICT(username) DO UPDATE SET data = excluded.data", [(k, json.dumps(v)) for k, v in items])
+
+    def save(self, repositories, owners):
+        """
+            Saves serialized repositories and owners, given as (key, dict) pairs.
+        """
+        connection = self.connect()
+        with connection:
+            self.write_repositories(repositories)
+            self.write_owners(owners)
+
+    def mark_synced(self):
+        """
+            Records that the source .json was just written from this snapshot, so it doesn't get imported back.
+        """
+        with self.connect():
+            self.connection.execute("INSERT OR REPLACE INTO metadata VALUES ('schema', ?)", (SCHEMA_VERSION,))
+            self.connection.execute("INSERT OR REPLACE INTO metadata VALUES ('source', ?)", (Snapshot.file_signature(self.source_path),))
+
+    def repository_keys(self) -> list[tuple[str, str, str]]:
+        """
+            Returns the key, owner and name of all repositories.
+        """
+        return self.connect().execute("SELECT key, owner, repo FROM repositories ORDER BY rowid").fetchall()
+
+    def owner_keys(self) -> list[str]:
+        return [row[0] for row in self.connect().execute("SELECT username FROM owners ORDER BY rowid")]
+
+    def tags(self, limit:int) -> list[str]:
+        """
+            Returns up to limit distinct tags of the current repositories, in the order they first appear in them.
+        """
+        tags = {}
+        # Rows come out in order of the repositories, so reading stops as soon as enough tags are found.
+        for row in self.connect().execute("SELECT t.tag FROM repositories r JOIN repository_tags t ON t.key = r.key ORDER BY r.rowid, t.position"):
+            if len(tags) >= limit:
+                break
+            tags[row[0]] = None
+        return list(tags)
+
+    def load_repository(self, key:str) -> dict:
+        return json.loads(self.connect().execute("SELECT data FROM repositories WHERE key = ?", (key,)).fetchone()[0])
+
+    def load_owner(self, username:str) -> dict:
+        return json.loads(self.connect().execute("SELECT data FROM owners WHERE username = ?", (username,)).fetchone()[0])
+
+    def all_repositories(self) -> dict[str, dict]:
+        return {k: json.loads(v) for k, v in self.connect().execute("SELECT key, data FROM repositories ORDER BY rowid")}
+
+    def all_owners(self) -> dict[str, dict]:
+        return {k: json.loads(v) for k, v in self.connect().execute("SELECT username, data FROM owners ORDER BY rowid")}
+
+class LazyEntityDict(MutableMapping):
+    """
+        Dict of entities whose values are loaded on first access.
+        Keys start out mapped to None until the loader is used to create their entity.
+    """
+    def __init__(self, loader, keys=()):
+        self.loader = loader
+        self.entries = dict.fromkeys(keys)
+
+    def __getitem__(self, key):
+        entity = self.entries[key]
+        if entity == None:
+            entity = self.loader(key)
+            self.entries[key] = entity
+        return entity
+
+    def __setitem__(self, key, value):
+        self.entries[key] = value
+
+    def __delitem__(self, key):
+        del self.entries[key]
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def __iter__(self):
+        return iter(self.entries)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def loaded_items(self):
+        """
+            Returns the entities that have been loaded or set; the rest are unchanged since they were persisted.
+        """
+        return [(k, v) for k, v in self.entries.items() if v != None]
@@ -0,0 +1,134 @@
+"""
+Measures the scraper's startup time and memory usage with a large synthetic persistence.json.
+
+Each start runs in a fresh process, in a temporary working directory. The first start builds the
+snapshot from persistence.json; the following ones are warm starts that only read the snapshot. Example:
+python startup_benchmark.py --repositories 100000
+"""
+
+import argparse, json, os, random, shutil, subprocess, sys, tempfile, time
+
+SCRAPER_DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+
+def generate_persistence(path:str, repositories_amount:int, commits_per_repository:int, seed:int=0):
+    """
+        Writes a persistence.json with the same structure as the scraper's.
+    """
+    rng = random.Random(seed)
+    topics = [f"topic-{i}" for i in range(5000)]
+    owners_amount = max(1, repositories_amount // 4)
+    repositories = {}
+    owners = {f"dev-{i}": {"username": f"dev-{i}", "avatar_url": f"https://avatars.githubusercontent.com/u/{i}?v=4", "repositories": []} for i in range(owners_amount)}
+    commits = {}
+    for i in range(repositories_amount):
+        owner = f"dev-{i % owners_amount}"
+        name = f"project-{i}"
+        repositories[f"{owner}/{name}"] = {
+            "owner": owner,
+            "repo": name,
+            "main_language": rng.choice(["JavaScript", "Python", "Java", "C++", "Rust", "Go", ""]),
+            "license": rng.choice(["MIT license", "Apache-2.0 license", ""]),
+            "tags": rng.sample(topics, rng.randint(0, 6)),
+            "description": f"Synthetic repository {i}",
+        }
+        owners[owner]["repositories"].append(name)
+        for j in range(commits_per_repository):
+            sha = f"{i:020x}{j:020x}"
+            commits[sha] = {"sha": sha, "commit_author": owner, "repo_owner": owner, "repo": name, "message": "Update README.md"}
+    with open(path, "w") as f:
+        json.dump({"repositories": repositories, "owners": owners, "topics": {}, "commits": commits, "trending_per_language": {}}, f, indent=2)
+
+def measure_startup():
+    """
+        Starts the scraper in the current directory and prints the measurements as .json.
+    """
+    import resource
+    sys.path.insert(0, SCRAPER_DIRECTORY)
+    start = time.perf_counter()
+    import scrape
+    import_time = time.perf_counter() - start
+    start = time.perf_counter()
+    scraper = scrape.Scraper()
+    init_time = time.perf_counter() - start
+    results = {
+        "import_time": import_time,
+        "init_time": init_time,
+        "peak_rss_kib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, # KiB on Linux
+        "queued_repositories": len(scraper.queued_repositories),
+        "queued_owners": len(scraper.queued_owners),
+        "topics_to_visit": len(scraper.topics_to_visit),
+        "topics": scraper.topics_to_visit,
+    }
+    print(json.dumps(results))
+
+def simulate_session(changed_repositories:int, seed:int=1):
+    """
+        Replaces the tags of some persisted repositories and exports, like a session that revisited them would.
+    """
+    sys.path.insert(0, SCRAPER_DIRECTORY)
+    import scrape
+    rng = random.Random(seed)
+    scraper = scrape.Scraper()
+    for key in list(scraper.repositories)[:changed_repositories]:
+        scraper.repositories[key].tags = [f"new-topic-{rng.randint(0, 200)}" for _ in range(rng.randint(0, 4))]
+    scraper.export()
+
+def expected_topics(persistence_path:str) -> list[str]:
+    """
+        Returns the topics the scraper queued before the snapshot, when it loaded all of persistence.json.
+    """
+    sys.path.insert(0, SCRAPER_DIRECTORY)
+    from scrape import Scraper
+    with open(persistence_path, "r") as f:
+        data = json.load(f)
+    topics = [topic for topic in Scraper.DEFAULT_TOPICS_TO_VISIT]
+    for v in data["repositories"].values():
+        for topic in v["tags"]:
+            if topic not in topics and len(topics) < Scraper.MAX_TOPICS_TO_VISIT:
+                topics.append(topic)
+    return topics
+
+def run_start(working_directory:str, mode:str="--child") -> dict:
+    result = subprocess.run([sys.executable, os.path.abspath(__file__), mode], cwd=working_directory, capture_output=True, text=True, check=True)
+    if mode != "--child":
+        return None
+    return json.loads(result.stdout.strip().split("\n")[-1])
+
+def print_start(label:str, results:dict):
+    print(f"{label}: import {results['import_time'] * 1000:.0f} ms, Scraper() {results['init_time'] * 1000:.0f} ms, peak RSS {results['peak_rss_kib'] / 1024:.1f} MiB ({results['queued_repositories']} repositories, {results['queued_owners']} owners and {results['topics_to_visit']} topics queued)")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measures the scraper's startup time with a synthetic persistence.json.")
+    parser.add_argument("--repositories", type=int, default=100000)
+    parser.add_argument("--commits-per-repository", type=int, default=3)
+    parser.add_argument("--warm-starts", type=int, default=3)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--session", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        measure_startup()
+    elif args.session:
+        simulate_session(max(1, args.repositories // 10))
+    else:
+        working_directory = tempfile.mkdtemp(prefix="scraper_startup_")
+        try:
+            persistence_path = os.path.join(working_directory, "persistence.json")
+            generate_persistence(persistence_path, args.repositories, args.commits_per_repository)
+            print(f"persistence.json: {os.path.getsize(persistence_path) / 1024 / 1024:.1f} MiB, {args.repositories} repositories")
+
+            print_start("First start (building snapshot)", run_start(working_directory))
+            print(f"persistence.db: {os.path.getsize(os.path.join(working_directory, 'persistence.db')) / 1024 / 1024:.1f} MiB")
+            warm_starts = [run_start(working_directory) for _ in range(args.warm_starts)]
+            median_start = sorted(warm_starts, key=lambda x: x["init_time"])[len(warm_starts) // 2]
+            print_start(f"Warm start (median of {len(warm_starts)})", median_start)
+            print("Warm start Scraper() times: " + ", ".join(f"{x['init_time'] * 1000:.0f} ms" for x in warm_starts))
+
+            # Check that topics are still seeded like before the snapshot after a session changes repository tags
+            run_start(working_directory, "--session")
+            topics = run_start(working_directory)["topics"]
+            if topics != expected_topics(persistence_path):
+                raise AssertionError("Topics seeded from the snapshot differ from the ones seeded from persistence.json")
+            print("Topics seeded after a session match the ones from persistence.json")
+        finally:
+            shutil.rmtree(working_directory, ignore_errors=True)